@@ -0,0 +1,423 @@
+"""Shared core for the task dashboard: login, Sheets access, filtering, rendering.
+
+App entry points stay thin launchers; everything that used to be duplicated
+across app copies (client setup, load_tasks, filter and KPI logic) lives here
+so a fix lands everywhere at once.
+"""
+
+import hmac
+import os
+import random
+import re
+import threading
+import time
+
+import bcrypt
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+import gspread
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+# On-disk snapshot so cold starts don't pay a full Sheets round trip
+SNAPSHOT_PATH = "/tmp/tasks.parquet"
+SNAPSHOT_TTL = 60  # seconds
+
+TEXT_COLS = ["Task", "Owner", "Project", "Status", "Priority", "Notes", "Task ID", "Blockers", "Project Team", "Latest Update"]
+DATE_COLS = ["Due Date", "Created At", "Updated At", "StartDate", "Deadline"]
+
+# First of these present in the sheet is the display sort key
+SORT_CANDIDATES = ["Deadline", "Due Date", "StartDate"]
+
+PREFERRED_ORDER = [
+    "Task", "Owner", "Project", "Status", "Task ID",
+    "StartDate", "Deadline", "Due Date",
+    "Latest Update", "Blockers", "Project Team", "Priority", "Notes"
+]
+
+
+# =========================
+# 🔐 Simple Login (Amani + Manager)
+# =========================
+def require_login():
+    st.set_page_config(page_title="Task Dashboard", page_icon="✅", layout="wide")
+
+    if "authenticated" not in st.session_state:
+        st.session_state["authenticated"] = False
+        st.session_state["user"] = None
+
+    if st.session_state["authenticated"]:
+        return
+
+    st.title("🔐 Secure Access")
+    st.caption("Please login to access the task tracking dashboard.")
+
+    # Make browser password managers more likely to offer saving credentials
+    username = st.text_input("Username", autocomplete="username")
+    password = st.text_input("Password", type="password", autocomplete="current-password")
+
+    if "auth" not in st.secrets:
+        st.error("Missing [auth] in Streamlit Secrets. Add usernames/passwords under [auth].")
+        st.stop()
+
+    auth = st.secrets["auth"]
+    # Prefer bcrypt hashes in secrets ([auth] password_hash = "...");
+    # plaintext entries remain supported but are compared in constant time
+    valid_users = {
+        auth.get("username"): (auth.get("password_hash"), auth.get("password")),
+        auth.get("manager_username"): (auth.get("manager_password_hash"), auth.get("manager_password")),
+    }
+
+    def check_password(candidate, entry):
+        if entry is None:
+            return False
+        password_hash, plaintext = entry
+        if password_hash:
+            return bcrypt.checkpw(candidate.encode(), password_hash.encode())
+        if plaintext:
+            # Compare as bytes: compare_digest rejects non-ASCII str input
+            return hmac.compare_digest(candidate.encode(), plaintext.encode())
+        return False
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        login_clicked = st.button("Login", use_container_width=True)
+
+    if login_clicked:
+        if username in valid_users and check_password(password, valid_users.get(username)):
+            st.session_state["authenticated"] = True
+            st.session_state["user"] = username
+            st.rerun()
+        else:
+            st.error("Invalid username or password")
+
+    st.stop()
+
+
+# ---------------------------
+# Secrets & config
+# ---------------------------
+def get_sheet_config():
+    """Validate Sheets secrets and return (spreadsheet_id, worksheet_name)."""
+    if "gcp_service_account" not in st.secrets:
+        st.error("❌ Missing `gcp_service_account` in Streamlit Secrets.")
+        st.stop()
+
+    if "sheets" not in st.secrets or "spreadsheet_id" not in st.secrets["sheets"]:
+        st.error("❌ Missing `sheets.spreadsheet_id` in Streamlit Secrets.")
+        st.stop()
+
+    return (
+        st.secrets["sheets"]["spreadsheet_id"],
+        st.secrets["sheets"].get("worksheet_name", "Tasks"),
+    )
+
+
+# ---------------------------
+# Google Sheets helpers
+# ---------------------------
+@st.cache_resource
+def get_credentials():
+    """Build service-account credentials once per process.
+
+    Every key access on st.secrets re-parses the underlying mapping, so
+    materialize the info into a plain dict before deriving Credentials.
+    """
+    sa_info = {k: st.secrets["gcp_service_account"][k] for k in st.secrets["gcp_service_account"]}
+    return Credentials.from_service_account_info(sa_info, scopes=SCOPES)
+
+@st.cache_resource
+def get_gspread_client():
+    """Create a cached gspread client from the cached credentials.
+
+    A single AuthorizedSession with keep-alive is injected so consecutive
+    Sheets calls reuse one TCP+TLS connection instead of handshaking per
+    request.
+    """
+    creds = get_credentials()
+    session = AuthorizedSession(creds)
+    session.headers.update({"Connection": "keep-alive"})
+    return gspread.Client(auth=creds, session=session)
+
+@st.cache_resource
+def get_worksheet():
+    """Resolve and cache the worksheet handle.
+
+    open_by_key and worksheet() are each a metadata round trip; worksheet
+    IDs are stable, so resolving once per process is enough.
+    """
+    spreadsheet_id, worksheet_name = get_sheet_config()
+    return get_gspread_client().open_by_key(spreadsheet_id).worksheet(worksheet_name)
+
+def fetch_values_with_retry(ws, attempts=4, initial=1.0, maximum=30.0):
+    """Fetch the value grid, retrying rate-limit and server errors.
+
+    The Sheets API throttles at ~100 reads/100s/user; a burst of reloads
+    used to surface as a hard failure. Back off exponentially with jitter
+    on 429/5xx, honoring a Retry-After header when the API sends one, and
+    re-raise anything else (or the last error) immediately.
+    """
+    delay = initial
+    for attempt in range(attempts):
+        try:
+            return ws.get_all_values()
+        except gspread.exceptions.APIError as e:
+            status = getattr(e.response, "status_code", None)
+            if attempt == attempts - 1 or status not in (429, 500, 502, 503):
+                raise
+            retry_after = e.response.headers.get("Retry-After") if e.response is not None else None
+            if retry_after and str(retry_after).isdigit():
+                sleep_for = min(float(retry_after), maximum)
+            else:
+                sleep_for = min(delay, maximum) * (1 + random.random())
+            time.sleep(sleep_for)
+            delay *= 2
+
+def fetch_tasks():
+    """Fetch tasks as a DataFrame straight from Google Sheets."""
+    ws = get_worksheet()
+
+    # One values.get round trip; skip get_all_records() which issues extra
+    # metadata calls and builds a dict per row.
+    values = fetch_values_with_retry(ws)
+    if not values:
+        return pd.DataFrame()
+
+    # First row is the header; normalize column names as we go
+    df = pd.DataFrame(values[1:], columns=[str(c).strip() for c in values[0]])
+
+    # Clean common text columns in one block operation instead of three
+    # intermediate Series (astype/fillna/strip) per column
+    text_cols = [c for c in TEXT_COLS if c in df.columns]
+    if text_cols:
+        df[text_cols] = df[text_cols].astype("string").apply(lambda s: s.str.strip()).fillna("")
+
+    # Parse dates if present. Sniffing the format per value dominates
+    # to_datetime cost, so detect ISO dates once from a sample and pass
+    # the format explicitly; cache=True dedupes repeated date strings.
+    present = [c for c in DATE_COLS if c in df.columns]
+    if present:
+        sample = next((v for v in df[present[0]] if v), "")
+        fmt = "%Y-%m-%d" if re.match(r"\d{4}-\d{2}-\d{2}$", str(sample)) else None
+        for col in present:
+            df[col] = pd.to_datetime(df[col], errors="coerce", format=fmt, cache=True)
+
+    # Arrow-backed dtypes make the per-rerun pandas->Arrow round trip in
+    # st.dataframe nearly free and shrink string memory substantially
+    df = df.convert_dtypes(dtype_backend="pyarrow")
+
+    # Low-cardinality columns drive every filter/sort/unique; as category
+    # dtype those all operate on integer codes instead of Python strings.
+    for col in ["Owner", "Project", "Status", "Priority"]:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    # Sort once per fetch; boolean-mask filtering preserves row order, so
+    # the render path never needs to re-sort per rerun
+    sort_col = next((c for c in SORT_CANDIDATES if c in df.columns), None)
+    if sort_col:
+        df = df.sort_values(sort_col, na_position="last", kind="stable", ignore_index=True)
+
+    # Precompute display column positions so the render path can iloc
+    # instead of doing label lookups per rerun
+    df.attrs["display_positions"] = display_positions(df.columns)
+
+    return df
+
+def save_snapshot(df: pd.DataFrame):
+    """Persist the latest fetch so future cold starts can skip the API call."""
+    try:
+        df.to_parquet(SNAPSHOT_PATH, compression="zstd")
+    except Exception:
+        # Snapshot is best-effort; never let it break the live fetch path
+        pass
+
+def refresh_snapshot():
+    """Background refresh: fetch from Sheets and rewrite the snapshot."""
+    try:
+        save_snapshot(fetch_tasks())
+    except Exception:
+        pass
+
+# Process-wide L2 cache shared across sessions: st.cache_data keys per
+# session, so without this N concurrent users meant N Sheets fetches.
+# The lock makes the first requester fetch while everyone else joins
+# that result instead of stampeding the API.
+_tasks_lock = threading.Lock()
+_tasks_cache = {"time": 0.0, "df": None}
+
+@st.cache_data(ttl=60, persist="disk", show_spinner=False)
+def load_tasks():
+    """Load tasks through the session cache and the shared process cache.
+
+    st.cache_data is the per-session L1; underneath, a lock-guarded
+    module-level cache serves all sessions in the process from one fetch
+    per TTL window.
+    """
+    with _tasks_lock:
+        if _tasks_cache["df"] is not None and time.time() - _tasks_cache["time"] < SNAPSHOT_TTL:
+            return _tasks_cache["df"]
+        df = _load_tasks_uncached()
+        _tasks_cache["df"] = df
+        _tasks_cache["time"] = time.time()
+        return df
+
+def _load_tasks_uncached():
+    """Load tasks, serving a recent Parquet snapshot when one exists.
+
+    Two-tier cache: a fresh snapshot (< SNAPSHOT_TTL) is returned directly;
+    a stale one is returned immediately while a background thread refreshes
+    it (stale-while-revalidate). Only a missing/unreadable snapshot pays the
+    full Sheets round trip before first paint.
+    """
+    try:
+        age = pd.Timestamp.now().timestamp() - os.path.getmtime(SNAPSHOT_PATH)
+        snapshot = pd.read_parquet(SNAPSHOT_PATH)
+    except (OSError, ValueError):
+        snapshot = None
+
+    if snapshot is not None:
+        if age >= SNAPSHOT_TTL:
+            threading.Thread(target=refresh_snapshot, daemon=True).start()
+        return snapshot
+
+    df = fetch_tasks()
+    save_snapshot(df)
+    return df
+
+def clear_caches():
+    """Drop every cache tier so the next load fetches from Sheets.
+
+    The Refresh button needs this: st.cache_data.clear() alone only empties
+    the per-session L1, after which load_tasks would still serve the
+    process-wide cache or the Parquet snapshot instead of going to the API.
+    """
+    st.cache_data.clear()
+    with _tasks_lock:
+        _tasks_cache["df"] = None
+        _tasks_cache["time"] = 0.0
+    try:
+        os.remove(SNAPSHOT_PATH)
+    except OSError:
+        pass
+
+
+# ---------------------------
+# Filters
+# ---------------------------
+def filter_options(df: pd.DataFrame):
+    """Unique sorted values per filter column.
+
+    The filter columns are categorical with lexically sorted categories,
+    so each option list is an attribute read rather than a unique+sort
+    scan; non-categorical columns fall back to scanning.
+    """
+    def options(col):
+        if col not in df.columns:
+            return []
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            return list(df[col].cat.categories)
+        return sorted(df[col].dropna().unique().tolist())
+
+    return options("Owner"), options("Project"), options("Status")
+
+def apply_filters(df: pd.DataFrame) -> pd.DataFrame:
+    """Render the filter widgets and return the filtered DataFrame."""
+    owners, projects, statuses = filter_options(df)
+
+    st.subheader("Filters")
+
+    # A refresh can introduce new Owner/Project/Status values; the keyed
+    # selections would otherwise persist across reruns and silently hide the
+    # new rows. Reset a widget's state whenever its option list changes so
+    # it falls back to the all-selected default.
+    for key, options in (("owner_filter", owners), ("project_filter", projects), ("status_filter", statuses)):
+        prev_key = f"_{key}_options"
+        if st.session_state.get(prev_key) != options:
+            st.session_state.pop(key, None)
+            st.session_state[prev_key] = options
+
+    col_a, col_b, col_c = st.columns(3)
+
+    # Stable keys keep Streamlit from tearing the widgets down and
+    # rebuilding them on every rerun
+    with col_a:
+        owner_filter = st.multiselect("Owner", owners, default=owners, key="owner_filter")
+
+    with col_b:
+        project_filter = st.multiselect("Project", projects, default=projects, key="project_filter")
+
+    with col_c:
+        status_filter = st.multiselect("Status", statuses, default=statuses, key="status_filter")
+
+    # Build one combined mask and slice once, instead of allocating an
+    # intermediate DataFrame per filter. A multiselect still holding the
+    # full option set contributes nothing (compared as sets, not lengths,
+    # so a retained selection never passes as the default), and with no
+    # filters narrowed the result stays the cached df itself — no copy
+    # needed since nothing downstream mutates it.
+    mask = np.ones(len(df), dtype=bool)
+
+    if owner_filter and set(owner_filter) != set(owners):
+        mask &= df["Owner"].isin(owner_filter).to_numpy()
+
+    if project_filter and set(project_filter) != set(projects):
+        mask &= df["Project"].isin(project_filter).to_numpy()
+
+    if status_filter and set(status_filter) != set(statuses):
+        mask &= df["Status"].isin(status_filter).to_numpy()
+
+    return df.loc[mask] if not mask.all() else df
+
+
+# ---------------------------
+# Rendering
+# ---------------------------
+def render_kpis(filtered: pd.DataFrame):
+    """Render the Total / Blocked / In Progress / Done metric cards."""
+    total_tasks = len(filtered)
+
+    # Normalize the Status column once and let value_counts fill every KPI,
+    # instead of re-running the string cleanup per status value.
+    if "Status" in filtered.columns:
+        status_counts = filtered["Status"].astype("string").str.strip().str.casefold().value_counts()
+    else:
+        status_counts = pd.Series(dtype="int64")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Total", total_tasks)
+    c2.metric("Blocked", int(status_counts.get("blocked", 0)))
+    c3.metric("In Progress", int(status_counts.get("in progress", 0)))
+    c4.metric("Done", int(status_counts.get("done", 0)))
+
+def display_positions(columns) -> list:
+    """Integer positions of the display columns, preferred ones first."""
+    preferred = [columns.get_loc(c) for c in PREFERRED_ORDER if c in columns]
+    rest = [i for i, c in enumerate(columns) if c not in PREFERRED_ORDER]
+    return preferred + rest
+
+def render_table(filtered: pd.DataFrame):
+    """Render the tasks table, preferred columns first.
+
+    Rows arrive already deadline-sorted from fetch_tasks and filtering
+    preserves that order, so no per-rerun sort is needed here.
+    """
+    st.subheader("📋 Tasks")
+    st.caption(f"Showing {len(filtered)} task(s) after filters.")
+
+    # Positions come precomputed from fetch_tasks when attrs survived the
+    # cache/filter path; recompute them otherwise (e.g. snapshot loads,
+    # where Parquet drops attrs)
+    positions = filtered.attrs.get("display_positions") or display_positions(filtered.columns)
+
+    # Column reorder only, via a positional gather; st.dataframe never
+    # mutates, so no copy needed
+    display_df = filtered.iloc[:, positions]
+
+    # The stable key lets the frontend diff row data instead of replacing
+    # the whole table element on each rerun
+    st.dataframe(display_df, use_container_width=True, hide_index=True, key="tasks_table")